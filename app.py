@@ -1,9 +1,14 @@
 import sys
-import json
+import json_utils
 from datetime import datetime
 from pathlib import Path
 import os
+import mmap
+import pickle
+import operator
 import subprocess
+from itertools import chain, islice
+from concurrent.futures import ThreadPoolExecutor
 
 # Add platform-specific imports for opening file explorer
 from sys import platform
@@ -12,73 +17,271 @@ from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, 
     QHBoxLayout, QLabel, QComboBox, QPushButton, 
     QTextEdit, QTabWidget, QFileDialog, QMessageBox,
-    QProgressBar, QTableWidget, QTableWidgetItem, QHeaderView,
-    QLineEdit
+    QProgressBar, QHeaderView,
+    QLineEdit, QTableView, QCompleter
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
-from schedule_crawler import ScheduleCrawler
-from ics_exporter import ICSExporter
+from PyQt6.QtCore import (
+    Qt, QObject, QRunnable, QThreadPool, QTimer, QSignalBlocker, pyqtSignal,
+    QAbstractTableModel, QModelIndex
+)
+from PyQt6.QtGui import QStandardItemModel, QStandardItem
+
+def load_cached_json(path):
+    """Load a JSON file, reusing a pickled cache beside it while the source is unchanged"""
+    cache_path = f"{path}.cache"
+    try:
+        if os.path.getmtime(cache_path) >= os.path.getmtime(path):
+            with open(cache_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return pickle.loads(mapped)
+    except (OSError, ValueError, EOFError, pickle.UnpicklingError):
+        pass  # Missing, stale or unreadable cache - fall back to parsing the JSON
+    
+    with open(path, 'rb') as f:
+        data = json_utils.loads(f.read())
+    try:
+        # Write to a temporary file and swap it in so readers never see a partial cache
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass  # Caching is best effort, e.g. on a read-only install
+    return data
+
+def collect(items, into):
+    """Pass items through unchanged while keeping a copy of each in `into`"""
+    for item in items:
+        into.append(item)
+        yield item
+
+# Upper bound on text pushed into preview widgets; laying out multi-MB text is itself slow
+PREVIEW_LIMIT = 65536
+PREVIEW_LINES = 200
+
+# Buffer size for streamed ICS writes, so a whole term usually reaches the disk in one syscall
+WRITE_BUFFER = 1 << 20
+
+# Flags for read-only schedule cells, computed once instead of per cell
+_READONLY_FLAGS = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+# Session periods in display order and fixed-layout cell templates
+PERIOD_TYPES = ('morning', 'afternoon', 'evening')
+TIME_TMPL = "%s (%s-%s)"
+CONTENT_TMPL = "Class: %s\nCode: %s\nPeriod: %s\nTaught: %s"
+STUDENT_CONTENT_TMPL = "Teacher: %s\nCode: %s\nPeriod: %s"
+COLUMN_WIDTHS = (180, 240, 120)  # Time, Subject, Room; Content stretches
+
+# Fetch every field each table needs from a session dict in one C-level call
+_session_get = operator.itemgetter(
+    'subject', 'room', 'class_name', 'class_code', 'period',
+    'taught_lessons', 'time_begin', 'time_end'
+)
+_student_session_get = operator.itemgetter(
+    'subject', 'room', 'teacher_name', 'class_code', 'period', 'time_begin', 'time_end'
+)
+
+def teacher_row(day, session):
+    """Format one teacher session as its Time, Subject, Room and Content cells"""
+    subject, room, class_name, class_code, period, taught, begin, end = _session_get(session)
+    return (TIME_TMPL % (day, begin, end),
+            subject,
+            room,
+            CONTENT_TMPL % (class_name, class_code, period, taught))
 
-class CrawlerWorker(QThread):
-    """Worker thread for crawling schedule data asynchronously"""
-    finished = pyqtSignal(dict)
+def student_row(day, session):
+    """Format one student session as its Time, Subject, Room and Content cells"""
+    subject, room, teacher_name, class_code, period, begin, end = _student_session_get(session)
+    return (TIME_TMPL % (day, begin, end),
+            subject,
+            room,
+            STUDENT_CONTENT_TMPL % (teacher_name, class_code, period))
+
+class WorkerSignals(QObject):
+    """Signals emitted by a thread pool task; QRunnable is not a QObject and cannot emit itself"""
+    # Crawlers send (schedule, saved file); ICS exports send (saved file, (preview, kept events or None))
+    finished = pyqtSignal(object, object)
     error = pyqtSignal(str)
     progress = pyqtSignal(str)
+    progress_pct = pyqtSignal(int)
+
+class BaseCrawlerWorker(QRunnable):
+    """Thread pool task that fetches one week with a shared crawler and saves it as JSON"""
+    # Crawler attribute that receives the teacher or class id; set by subclasses
+    id_field = None
 
-    def __init__(self, year_study, term_id, professor_id, week):
+    # One crawler (and its HTTP session) per subclass shared by every fetch; fetches never overlap
+    _crawler = None
+
+    def __init__(self, year_study, term_id, target_id, week, output_file):
         super().__init__()
+        self.signals = WorkerSignals()
         self.year_study = year_study
         self.term_id = term_id
-        self.professor_id = professor_id
+        self.target_id = target_id
         self.week = week
+        self.output_file = output_file
+
+    def create_crawler(self):
+        """Build the crawler shared by every fetch of this worker class"""
+        raise NotImplementedError
+
+    def fetch(self, crawler):
+        """Fetch and parse the requested week"""
+        return crawler.fetch_schedule(self.week)
 
     def run(self):
         """Execute the crawler operation in a separate thread to avoid blocking UI"""
         try:
-            self.progress.emit("Initializing crawler...")
-            crawler = ScheduleCrawler()
+            self.signals.progress.emit("Initializing crawler...")
+            worker_cls = type(self)
+            if worker_cls._crawler is None:
+                worker_cls._crawler = self.create_crawler()
+            crawler = worker_cls._crawler
             crawler.year_study = self.year_study
             crawler.term_id = self.term_id
-            crawler.professor_id = self.professor_id
+            setattr(crawler, self.id_field, self.target_id)
+            
+            self.signals.progress.emit("Fetching schedule...")
+            schedule = self.fetch(crawler)
+            self.signals.progress.emit("Schedule fetched successfully!")
             
-            self.progress.emit("Fetching schedule...")
-            schedule = crawler.fetch_schedule(self.week)
-            self.progress.emit("Schedule fetched successfully!")
-            self.finished.emit(schedule)
+            # Save compact JSON here so large writes never stall the UI thread
+            with open(self.output_file, 'wb') as f:
+                f.write(json_utils.dumps(schedule))
+            self.signals.progress_pct.emit(90)
+            self.signals.finished.emit(schedule, self.output_file)
         except Exception as e:
-            self.error.emit(str(e))
+            self.signals.error.emit(str(e))
 
-class ICSWorker(QThread):
-    """Worker thread for ICS file generation operations"""
-    finished = pyqtSignal(str)
-    error = pyqtSignal(str)
-    progress = pyqtSignal(str)
+class CrawlerWorker(BaseCrawlerWorker):
+    """Thread pool task for crawling teacher schedule data asynchronously"""
+    id_field = 'professor_id'
+
+    def create_crawler(self):
+        # Imported here so requests/BeautifulSoup load off the UI thread on first use
+        from schedule_crawler import ScheduleCrawler
+        return ScheduleCrawler()
+
+    def fetch(self, crawler):
+        return crawler.fetch_schedule(self.week, self.signals.progress_pct.emit)
+
+class StudentCrawlerWorker(BaseCrawlerWorker):
+    """Thread pool task for crawling student schedule data asynchronously"""
+    id_field = 'class_id'
+
+    def create_crawler(self):
+        # Imported here so requests/lxml load off the UI thread on first use
+        from student_schedule_crawler import StudentScheduleCrawler
+        return StudentScheduleCrawler()
+
+    def fetch(self, crawler):
+        # The student crawler reports no progress of its own
+        self.signals.progress_pct.emit(10)
+        schedule = crawler.fetch_schedule(self.week)
+        self.signals.progress_pct.emit(70)
+        return schedule
 
-    def __init__(self, schedule_file):
+class ICSWorker(QRunnable):
+    """Thread pool task for ICS file generation operations"""
+    # One exporter per exporter class shared by every export; exporters keep no per-call state
+    _exporters = {}
+
+    def __init__(self, output_file, schedule_file=None, schedule_data=None, exporter_cls=None,
+                 events=None, keep_events=False):
         super().__init__()
+        self.signals = WorkerSignals()
+        self.output_file = output_file
         self.schedule_file = schedule_file
+        self.schedule_data = schedule_data
+        self.exporter_cls = exporter_cls
+        self.events = events
+        self.keep_events = keep_events
 
     def run(self):
-        """Execute the ICS file generation operation in a separate thread to avoid blocking UI"""
+        """Generate and save the ICS file in a separate thread to avoid blocking UI"""
         try:
-            self.progress.emit("Creating ICS file...")
-            exporter = ICSExporter()
-            ics_content = exporter.create_ics_content(self.schedule_file)
-            self.progress.emit("ICS content generated successfully!")
-            self.finished.emit(ics_content)
+            self.signals.progress.emit("Creating ICS file...")
+            self.signals.progress_pct.emit(10)
+            exporter_cls = self.exporter_cls
+            if exporter_cls is None:
+                from ics_exporter import ICSExporter
+                exporter_cls = ICSExporter
+            exporter = ICSWorker._exporters.get(exporter_cls)
+            if exporter is None:
+                exporter = ICSWorker._exporters[exporter_cls] = exporter_cls()
+            # In-memory data skips the file, and events of an earlier export skip building them
+            generated = None
+            if self.events is not None:
+                lines = exporter.iter_ics_lines(events=self.events)
+            elif self.keep_events:
+                # Hand the events back so the window can reuse them for the same schedule
+                generated = []
+                lines = exporter.iter_ics_lines(
+                    events=collect(exporter.iter_events(self.schedule_data), generated))
+            else:
+                source = self.schedule_file if self.schedule_data is None else self.schedule_data
+                lines = exporter.iter_ics_lines(source)
+            
+            # Stream events to a temporary file and swap it in only once generation succeeded,
+            # so a failed export never replaces the previous one; only the first lines are
+            # kept for the preview
+            preview = list(islice(lines, PREVIEW_LINES))
+            tmp_path = f"{self.output_file}.{os.getpid()}.tmp"
+            try:
+                with open(tmp_path, 'w', encoding='utf-8', newline='', buffering=WRITE_BUFFER) as f:
+                    f.writelines(f"{line}\r\n" for line in chain(preview, lines))
+                os.replace(tmp_path, self.output_file)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            self.signals.progress.emit("ICS content generated successfully!")
+            self.signals.progress_pct.emit(90)
+            self.signals.finished.emit(self.output_file, ("\r\n".join(preview), generated))
         except Exception as e:
-            self.error.emit(str(e))
+            self.signals.error.emit(str(e))
 
-    def create_from_data(self, schedule_data):
-        """Create ICS content directly from schedule data without reading from file"""
-        try:
-            self.progress.emit("Creating ICS file...")
-            exporter = ICSExporter()
-            ics_content = exporter.create_ics_content_from_data(schedule_data)
-            self.progress.emit("ICS content generated successfully!")
-            self.finished.emit(ics_content)
-        except Exception as e:
-            self.error.emit(str(e))
+class ScheduleModel(QAbstractTableModel):
+    """Read-only table model holding schedule sessions as parallel column lists"""
+    HEADERS = ('Time', 'Subject', 'Room', 'Content')
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._time = []
+        self._subject = []
+        self._room = []
+        self._content = []
+        self._columns = (self._time, self._subject, self._room, self._content)
+
+    def set_sessions(self, time, subject, room, content):
+        """Replace all rows with a single model reset instead of per-cell updates"""
+        self.beginResetModel()
+        for column, values in zip(self._columns, (time, subject, room, content)):
+            column[:] = values
+        self.endResetModel()
+
+    def clear(self):
+        """Remove all rows from the model"""
+        self.set_sessions([], [], [], [])
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._time)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and index.isValid():
+            return self._columns[index.column()][index.row()]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        return _READONLY_FLAGS
 
 class MainWindow(QMainWindow):
     """Main application window containing all UI components and logic"""
@@ -122,33 +325,39 @@ class MainWindow(QMainWindow):
         self.current_schedule = None
         self.current_student_schedule = None
         self.last_ics_file = None
+        self._last_schedule = None
+        self._last_schedule_file = None
+        self._running_jobs = set()
+        self._ics_cache = {}  # (exporter class, id(schedule)) -> events of the current schedules
 
     def load_config_data(self):
         """Load configuration data from JSON files including years, terms, teachers, and weeks"""
         try:
+            # Read all config files concurrently; each read is served from cache when fresh
+            paths = ['config/year_studies.json', 'config/terms.json',
+                     'config/teachers.json', 'config/weeks.json']
+            with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+                years, terms, teachers, weeks = executor.map(load_cached_json, paths)
+            
             # Load years
-            with open('config/year_studies.json', 'r', encoding='utf-8') as f:
-                years = json.load(f)
-                self.year_combo.addItems([year['value'] for year in years])
+            self.year_combo.addItems([year['value'] for year in years])
             
             # Load terms
-            with open('config/terms.json', 'r', encoding='utf-8') as f:
-                terms = json.load(f)
-                self.term_combo.addItems([term['value'] for term in terms])
+            self.term_combo.addItems([term['value'] for term in terms])
             
-            # Load teachers with modified storage
-            with open('config/teachers.json', 'r', encoding='utf-8') as f:
-                self.all_teachers = json.load(f)
-                for teacher in self.all_teachers:
-                    self.teacher_combo.addItem(
-                        f"{teacher['full_name']} ({teacher['id']})",
-                        teacher['id']
-                    )
+            # Load teachers into the model once; the completer searches it
+            self.all_teachers = teachers
+            items = []
+            for teacher in self.all_teachers:
+                item = QStandardItem(f"{teacher['full_name']} ({teacher['id']})")
+                item.setData(teacher['id'], Qt.ItemDataRole.UserRole)
+                items.append(item)
+            self._teachers_model.clear()
+            self._teachers_model.appendColumn(items)
+            self.teacher_combo.setCurrentIndex(0)
             
             # Load weeks
-            with open('config/weeks.json', 'r', encoding='utf-8') as f:
-                weeks = json.load(f)
-                self.week_combo.addItems([str(week['label']) for week in weeks])
+            self.week_combo.addItems([str(week['label']) for week in weeks])
                 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load configuration: {str(e)}")
@@ -189,25 +398,27 @@ class MainWindow(QMainWindow):
         term_layout.addWidget(self.term_combo)
         form_layout.addLayout(term_layout)
         
-        # Teacher selection with filter
-        teacher_layout = QVBoxLayout()  # Changed to VBox to stack filter and combo
-        teacher_header = QHBoxLayout()
-        teacher_header.addWidget(QLabel("Teacher:"))
-        
-        # Add search box
-        self.teacher_filter = QLineEdit()
-        self.teacher_filter.setPlaceholderText("Search teacher...")
-        self.teacher_filter.textChanged.connect(self.filter_teachers)
-        teacher_header.addWidget(self.teacher_filter)
-        
-        teacher_layout.addLayout(teacher_header)
+        # Teacher selection; the editable combo searches itself through a completer
+        teacher_layout = QHBoxLayout()
+        teacher_layout.addWidget(QLabel("Teacher:"))
         
+        self._teachers_model = QStandardItemModel(self)
         self.teacher_combo = QComboBox()
+        self.teacher_combo.setModel(self._teachers_model)
         self.teacher_combo.setMaxVisibleItems(10)  # Show more items in dropdown
+        self.teacher_combo.setEditable(True)
+        self.teacher_combo.setInsertPolicy(QComboBox.InsertPolicy.NoInsert)
+        self.teacher_combo.lineEdit().setPlaceholderText("Search teacher...")
+        
+        # Matching on the label (name and ID) runs inside Qt, with no Python per keystroke
+        teacher_completer = QCompleter(self._teachers_model, self.teacher_combo)
+        teacher_completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        teacher_completer.setFilterMode(Qt.MatchFlag.MatchContains)
+        self.teacher_combo.setCompleter(teacher_completer)
         teacher_layout.addWidget(self.teacher_combo)
         form_layout.addLayout(teacher_layout)
         
-        # Store original teacher items for filtering
+        # Store original teacher items
         self.all_teachers = []
         
         # Week selection
@@ -227,6 +438,12 @@ class MainWindow(QMainWindow):
         self.export_ics_button.clicked.connect(self.export_current_to_ics)
         self.export_ics_button.setEnabled(False)  # Disabled by default
         button_layout.addWidget(self.export_ics_button)
+
+        self.show_json_button = QPushButton("Show raw JSON")
+        self.show_json_button.clicked.connect(
+            lambda: self.show_raw_json(self.crawler_output, self.current_schedule))
+        self.show_json_button.setEnabled(False)
+        button_layout.addWidget(self.show_json_button)
         form_layout.addLayout(button_layout)
         
         # Progress bar
@@ -236,11 +453,11 @@ class MainWindow(QMainWindow):
         layout.addWidget(self.crawler_progress)
         
         # Schedule Table
-        self.schedule_table = QTableWidget()
-        self.schedule_table.setColumnCount(4)
-        self.schedule_table.setHorizontalHeaderLabels(['Time', 'Subject', 'Room', 'Content'])
-        self.schedule_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
-        self.schedule_table.horizontalHeader().setStretchLastSection(True)
+        self.schedule_table = QTableView()
+        self.schedule_model = ScheduleModel(self)
+        self.schedule_table.setModel(self.schedule_model)
+        self.set_column_widths(self.schedule_table)
+        self.set_row_lines(self.schedule_table, CONTENT_TMPL.count('\n') + 1)
         layout.addWidget(self.schedule_table)
         
         # Results area (make it smaller since we have the table now)
@@ -293,9 +510,16 @@ class MainWindow(QMainWindow):
         # Add search box for class
         self.class_filter = QLineEdit()
         self.class_filter.setPlaceholderText("Search class...")
-        self.class_filter.textChanged.connect(self.filter_classes)
         class_header.addWidget(self.class_filter)
         
+        # Debounce filtering so only the last keystroke of a burst rebuilds the list
+        self._class_filter_timer = QTimer(self)
+        self._class_filter_timer.setSingleShot(True)
+        self._class_filter_timer.setInterval(150)
+        self._class_filter_timer.timeout.connect(
+            lambda: self.filter_classes(self.class_filter.text()))
+        self.class_filter.textChanged.connect(lambda _: self._class_filter_timer.start())
+        
         class_layout.addLayout(class_header)
         
         self.class_combo = QComboBox()
@@ -303,6 +527,11 @@ class MainWindow(QMainWindow):
         class_layout.addWidget(self.class_combo)
         form_layout.addLayout(class_layout)
         
+        # Store original class items for filtering
+        self.all_classes = []
+        self._class_labels = []
+        self._class_keys = []
+        
         # Week selection
         week_layout = QHBoxLayout()
         week_layout.addWidget(QLabel("Week:"))
@@ -320,6 +549,12 @@ class MainWindow(QMainWindow):
         self.student_export_ics_button.clicked.connect(self.export_current_student_to_ics)
         self.student_export_ics_button.setEnabled(False)
         button_layout.addWidget(self.student_export_ics_button)
+
+        self.student_show_json_button = QPushButton("Show raw JSON")
+        self.student_show_json_button.clicked.connect(
+            lambda: self.show_raw_json(self.student_output, self.current_student_schedule))
+        self.student_show_json_button.setEnabled(False)
+        button_layout.addWidget(self.student_show_json_button)
         form_layout.addLayout(button_layout)
         
         # Progress bar
@@ -329,11 +564,11 @@ class MainWindow(QMainWindow):
         layout.addWidget(self.student_progress)
         
         # Schedule Table
-        self.student_table = QTableWidget()
-        self.student_table.setColumnCount(4)
-        self.student_table.setHorizontalHeaderLabels(['Time', 'Subject', 'Room', 'Content'])
-        self.student_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
-        self.student_table.horizontalHeader().setStretchLastSection(True)
+        self.student_table = QTableView()
+        self.student_model = ScheduleModel(self)
+        self.student_table.setModel(self.student_model)
+        self.set_column_widths(self.student_table)
+        self.set_row_lines(self.student_table, STUDENT_CONTENT_TMPL.count('\n') + 1)
         layout.addWidget(self.student_table)
         
         # Results area
@@ -345,63 +580,76 @@ class MainWindow(QMainWindow):
     def load_student_config_data(self):
         """Load student-specific configuration data"""
         try:
-            # Load years (reuse existing years)
-            with open('student_config/year_studies.json', 'r', encoding='utf-8') as f:
-                years = json.load(f)
-                self.student_year_combo.addItems([year['value'] for year in years])
+            paths = ['student_config/year_studies.json', 'student_config/terms.json',
+                     'student_config/classes.json', 'student_config/weeks.json']
+            with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+                years, terms, classes, weeks = executor.map(load_cached_json, paths)
+            
+            # Load years
+            self.student_year_combo.addItems([year['value'] for year in years])
             
             # Load terms
-            with open('student_config/terms.json', 'r', encoding='utf-8') as f:
-                terms = json.load(f)
-                self.student_term_combo.addItems([term['value'] for term in terms])
+            self.student_term_combo.addItems([term['value'] for term in terms])
             
             # Load classes
-            with open('student_config/classes.json', 'r', encoding='utf-8') as f:
-                self.all_classes = json.load(f)
-                for class_item in self.all_classes:
-                    self.class_combo.addItem(class_item['value'])
+            self.all_classes = classes
+            # Parallel label/key lists; lowercased keys are computed once, not on every keystroke
+            self._class_labels = [class_item['value'] for class_item in self.all_classes]
+            self._class_keys = [label.lower() for label in self._class_labels]
+            self._set_class_items(self._class_labels)
             
             # Load weeks
-            with open('student_config/weeks.json', 'r', encoding='utf-8') as f:
-                weeks = json.load(f)
-                self.student_week_combo.addItems([str(week['label']) for week in weeks])
+            self.student_week_combo.addItems([str(week['label']) for week in weeks])
                 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load student configuration: {str(e)}")
 
     def fetch_schedule(self):
         """Initiate the schedule crawling process with selected parameters"""
+        if 'crawl' in self._running_jobs:
+            return  # A fetch is already in progress
+        
         year_study = self.year_combo.currentText()
         term_id = self.term_combo.currentText()
-        professor_id = self.teacher_combo.currentData()
         week = int(self.week_combo.currentText())
+
+        # The combo is editable, so its index can lag behind the typed text; resolve the text itself
+        idx = self.teacher_combo.findText(self.teacher_combo.currentText())
+        if idx == -1:
+            QMessageBox.warning(self, "Warning", "Please select a teacher from the list")
+            return
+        professor_id = self.teacher_combo.itemData(idx, Qt.ItemDataRole.UserRole)
         
         self.fetch_button.setEnabled(False)
         self.crawler_output.clear()
         self.crawler_progress.setValue(0)
         
-        self.crawler_worker = CrawlerWorker(year_study, term_id, professor_id, week)
-        self.crawler_worker.finished.connect(self.handle_crawler_result)
-        self.crawler_worker.error.connect(self.handle_crawler_error)
-        self.crawler_worker.progress.connect(self.update_crawler_progress)
-        self.crawler_worker.start()
+        # Generate filename with current date
+        filename = f"schedule_{datetime.now().strftime('%Y%m%d')}.json"
+        
+        self.crawler_worker = CrawlerWorker(year_study, term_id, professor_id, week, filename)
+        self.crawler_worker.signals.finished.connect(self.handle_crawler_result)
+        self.crawler_worker.signals.error.connect(self.handle_crawler_error)
+        self.crawler_worker.signals.progress.connect(self.update_crawler_progress)
+        self.crawler_worker.signals.progress_pct.connect(
+            lambda pct: self.set_progress_value(self.crawler_progress, pct))
+        self._start_worker('crawl', self.crawler_worker)
 
-    def handle_crawler_result(self, schedule):
-        """Process and display the crawled schedule data"""
+    def handle_crawler_result(self, schedule, filename):
+        """Process and display the crawled schedule data already saved by the worker"""
         try:
             # Store the current schedule
             self.current_schedule = schedule
+            self._ics_cache.clear()
             
-            # Enable the export button
-            self.export_ics_button.setEnabled(True)
-            
-            # Generate filename with current date
-            current_date = datetime.now().strftime("%Y%m%d")
-            filename = f'schedule_{current_date}.json'
+            # Remember the saved file so exporting it later can skip the JSON round-trip
+            self._last_schedule = schedule
+            full_path = os.path.abspath(filename)
+            self._last_schedule_file = (full_path, os.path.getmtime(full_path))
             
-            # Save to JSON file
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(schedule, f, ensure_ascii=False, indent=2)
+            # Enable the export and raw JSON buttons
+            self.export_ics_button.setEnabled(True)
+            self.show_json_button.setEnabled(True)
             
             # Update table with schedule data
             self.update_schedule_table(schedule)
@@ -415,13 +663,12 @@ class MainWindow(QMainWindow):
             )
             self.metadata_label.setText(metadata_text)
             
-            # Display full schedule in output area
-            self.crawler_output.setText(json.dumps(schedule, ensure_ascii=False, indent=2))
             self.crawler_progress.setValue(100)
-            QMessageBox.information(self, "Success", f"Schedule saved to {filename}")
+            self.statusBar().showMessage(f"Schedule saved to {filename}", 5000)
         except Exception as e:
             self.current_schedule = None
             self.export_ics_button.setEnabled(False)
+            self.show_json_button.setEnabled(False)
             QMessageBox.critical(self, "Error", f"Failed to save schedule: {str(e)}")
         finally:
             self.fetch_button.setEnabled(True)
@@ -429,58 +676,56 @@ class MainWindow(QMainWindow):
     def update_schedule_table(self, schedule):
         """Update the UI table with the fetched schedule data"""
         schedule_data = schedule.get('schedule', {})
-        all_sessions = []
-        
-        # Collect all sessions from the schedule
-        for day, periods in schedule_data.items():
-            for period_type in ['morning', 'afternoon', 'evening']:
-                for session in periods.get(period_type, []):
-                    if session:  # Check if session exists
-                        time_str = f"{day} ({session['time_begin']}-{session['time_end']})"
-                        all_sessions.append({
-                            'time': time_str,
-                            'subject': session['subject'],
-                            'room': session['room'],
-                            'content': (f"Class: {session['class_name']}\n"
-                                      f"Code: {session['class_code']}\n"
-                                      f"Period: {session['period']}\n"
-                                      f"Taught: {session['taught_lessons']}")
-                        })
-
-        # Update table
-        self.schedule_table.setRowCount(len(all_sessions))
-        for row, session in enumerate(all_sessions):
-            self.schedule_table.setItem(row, 0, QTableWidgetItem(session['time']))
-            self.schedule_table.setItem(row, 1, QTableWidgetItem(session['subject']))
-            self.schedule_table.setItem(row, 2, QTableWidgetItem(session['room']))
-            self.schedule_table.setItem(row, 3, QTableWidgetItem(session['content']))
-            
-            # Make cells read-only
-            for col in range(4):
-                item = self.schedule_table.item(row, col)
-                if item:
-                    item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        
+        # Build each row directly in column order, without an intermediate dict
+        rows = [
+            teacher_row(day, session)
+            for day, periods in schedule_data.items()
+            for period_type in PERIOD_TYPES
+            for session in periods.get(period_type, ())
+            if session
+        ]
 
-        # Adjust row heights to content
-        for row in range(self.schedule_table.rowCount()):
-            self.schedule_table.resizeRowToContents(row)
+        # Update model with a single reset; the view only renders visible cells
+        self.schedule_model.set_sessions(*(zip(*rows) if rows else ((),) * 4))
 
     def handle_crawler_error(self, error_msg):
         """Handle and display any errors that occur during crawling"""
         self.current_schedule = None
         self.export_ics_button.setEnabled(False)
+        self.show_json_button.setEnabled(False)
         self.crawler_output.setText(f"Error: {error_msg}")
         self.crawler_progress.setValue(0)
         self.fetch_button.setEnabled(True)
         QMessageBox.critical(self, "Error", error_msg)
-        self.schedule_table.setRowCount(0)  # Clear table on error
+        self.schedule_model.clear()  # Clear table on error
+
+    def show_raw_json(self, output, schedule):
+        """Pretty-print a fetched schedule into an output area, only when the user asks for it"""
+        if schedule:
+            output.setPlainText(json_utils.dumps(schedule, indent=True).decode('utf-8')[:PREVIEW_LIMIT])
 
     def update_crawler_progress(self, message):
-        """Update the progress bar and display crawling status messages"""
+        """Display crawling status messages"""
         self.crawler_output.append(message)
-        # Simulate progress
-        current = self.crawler_progress.value()
-        self.crawler_progress.setValue(min(current + 30, 90))
+
+    def set_progress_value(self, progress_bar, pct):
+        """Move a progress bar to a reported percentage, repainting only on change"""
+        if pct != progress_bar.value():
+            progress_bar.setValue(pct)
+
+    def set_column_widths(self, table):
+        """Use fixed interactive column widths so populating never measures cells"""
+        header = table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        for column, width in enumerate(COLUMN_WIDTHS):
+            header.resizeSection(column, width)
+        header.setStretchLastSection(True)
+
+    def set_row_lines(self, table, lines):
+        """Give every row a fixed height for the number of content lines, skipping text layout"""
+        line_height = table.fontMetrics().lineSpacing()
+        table.verticalHeader().setDefaultSectionSize(lines * line_height + 6)
 
     def select_schedule_file(self):
         """Open file dialog for selecting a saved schedule JSON file"""
@@ -500,70 +745,109 @@ class MainWindow(QMainWindow):
         if schedule_file == "No file selected":
             QMessageBox.warning(self, "Warning", "Please select a schedule file first")
             return
+        if 'ics' in self._running_jobs:
+            return  # An export is already in progress
         
         self.export_button.setEnabled(False)
         self.ics_output.clear()
         self.ics_progress.setValue(0)
         
-        self.ics_worker = ICSWorker(schedule_file)
-        self.ics_worker.finished.connect(self.handle_ics_result)
-        self.ics_worker.error.connect(self.handle_ics_error)
-        self.ics_worker.progress.connect(self.update_ics_progress)
-        self.ics_worker.start()
+        # Reuse the schedule fetched in this session if the selected file is the one we saved
+        schedule_data = None
+        if self._last_schedule is not None and self._last_schedule_file:
+            path, mtime = self._last_schedule_file
+            if (os.path.abspath(schedule_file) == path
+                    and os.path.exists(path) and os.path.getmtime(path) == mtime):
+                schedule_data = self._last_schedule
+        
+        self.ics_worker = self._make_ics_worker(
+            self._ics_output_path("teaching_schedule"),
+            schedule_data,
+            schedule_file=schedule_file
+        )
+        self.ics_worker.signals.finished.connect(self.handle_ics_result)
+        self.ics_worker.signals.error.connect(self.handle_ics_error)
+        self.ics_worker.signals.progress.connect(self.update_ics_progress)
+        self.ics_worker.signals.progress_pct.connect(
+            lambda pct: self.set_progress_value(self.ics_progress, pct))
+        self._start_worker('ics', self.ics_worker)
 
     def export_current_to_ics(self):
         """Export currently loaded schedule data to ICS format"""
         if not self.current_schedule:
             QMessageBox.warning(self, "Warning", "No schedule data available")
             return
+        if 'ics' in self._running_jobs:
+            return  # An export is already in progress
         
         self.export_ics_button.setEnabled(False)
         self.ics_progress.setValue(0)
         
-        # Create a new worker for ICS export
-        self.ics_worker = ICSWorker(None)  # No file needed
-        self.ics_worker.finished.connect(self.handle_ics_result)
-        self.ics_worker.error.connect(self.handle_ics_error)
-        self.ics_worker.progress.connect(self.update_ics_progress)
-        
-        # Use create_from_data instead of run
-        self.ics_worker.create_from_data(self.current_schedule)
+        # Create a new worker for ICS export from the in-memory schedule (no file needed)
+        self.ics_worker = self._make_ics_worker(
+            self._ics_output_path("teaching_schedule"),
+            self.current_schedule
+        )
+        self.ics_worker.signals.finished.connect(self.handle_ics_result)
+        self.ics_worker.signals.error.connect(self.handle_ics_error)
+        self.ics_worker.signals.progress.connect(self.update_ics_progress)
+        self.ics_worker.signals.progress_pct.connect(
+            lambda pct: self.set_progress_value(self.ics_progress, pct))
+        self._start_worker('ics', self.ics_worker)
+
+    def _start_worker(self, job, worker):
+        """Run a worker on the shared thread pool and track it until it finishes or fails"""
+        self._running_jobs.add(job)
+        worker.signals.finished.connect(lambda *args: self._running_jobs.discard(job))
+        worker.signals.error.connect(lambda *args: self._running_jobs.discard(job))
+        QThreadPool.globalInstance().start(worker)
 
-    def handle_ics_result(self, ics_content):
-        """Process and save the generated ICS content"""
+    def _make_ics_worker(self, output_file, schedule_data, exporter_cls=None, schedule_file=None):
+        """Create an ICS worker that reuses the events of an in-memory schedule exported before"""
+        events = None
+        if schedule_data is not None:
+            key = (exporter_cls, id(schedule_data))
+            events = self._ics_cache.get(key)
+        worker = ICSWorker(
+            output_file,
+            schedule_file=schedule_file,
+            schedule_data=schedule_data,
+            exporter_cls=exporter_cls,
+            events=events,
+            keep_events=schedule_data is not None and events is None
+        )
+        if worker.keep_events:
+            worker.signals.finished.connect(
+                lambda _, result: self._cache_ics_events(key, schedule_data, result[1]))
+        return worker
+
+    def _cache_ics_events(self, key, schedule, events):
+        """Remember exported events, on the UI thread, while their schedule is still a current one"""
+        # A fetch may have replaced the schedule (and cleared the cache) while the export ran
+        if events is not None and (schedule is self.current_schedule
+                                   or schedule is self.current_student_schedule
+                                   or schedule is self._last_schedule):
+            self._ics_cache[key] = events
+
+    def _ics_output_path(self, prefix):
+        """Build the full path of today's ICS file in the current directory"""
+        output_file = f"{prefix}_{datetime.now().strftime('%Y%m%d')}.ics"
+        return os.path.join(os.getcwd(), output_file)
+
+    def handle_ics_result(self, full_path, result):
+        """Display the ICS content saved by the worker"""
+        ics_preview, _ = result
         try:
-            # Generate filename
-            output_file = f"teaching_schedule_{datetime.now().strftime('%Y%m%d')}.ics"
-            
-            # Save ICS file with full path
-            current_dir = os.getcwd()
-            full_path = os.path.join(current_dir, output_file)
-            
-            with open(full_path, 'w', encoding='utf-8') as f:
-                f.write(ics_content)
+            output_file = os.path.basename(full_path)
             
             # Store the last ICS file path
             self.last_ics_file = full_path
+            self.open_location_button.setEnabled(True)
             
             # Display in output area
-            self.ics_output.setText(ics_content)
+            self.ics_output.setPlainText(ics_preview[:PREVIEW_LIMIT])
             self.ics_progress.setValue(100)
-            
-            # Create result message box with option to open location
-            msg_box = QMessageBox()
-            msg_box.setWindowTitle("Success")
-            msg_box.setText(f"Calendar exported to {output_file}")
-            msg_box.setIcon(QMessageBox.Icon.Information)
-            
-            # Add custom button to open file location
-            open_location_button = msg_box.addButton("Open Location", QMessageBox.ButtonRole.ActionRole)
-            close_button = msg_box.addButton(QMessageBox.StandardButton.Close)
-            
-            msg_box.exec()
-            
-            # Handle button click
-            if msg_box.clickedButton() == open_location_button:
-                self.open_file_location(full_path)
+            self.statusBar().showMessage(f"Calendar exported to {output_file}", 5000)
                 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save ICS file: {str(e)}")
@@ -594,44 +878,38 @@ class MainWindow(QMainWindow):
         QMessageBox.critical(self, "Error", error_msg)
 
     def update_ics_progress(self, message):
-        """Update the progress bar and display ICS export status messages"""
+        """Display ICS export status messages"""
         self.ics_output.append(message)
-        # Simulate progress
-        current = self.ics_progress.value()
-        self.ics_progress.setValue(min(current + 45, 90))
-
-    def filter_teachers(self, search_text):
-        """Filter the teachers dropdown list based on search text"""
-        self.teacher_combo.clear()
-        search_text = search_text.lower()
-        
-        for teacher in self.all_teachers:
-            # Search in both full name and ID
-            if (search_text in teacher['full_name'].lower() or 
-                search_text in teacher['id'].lower()):
-                self.teacher_combo.addItem(
-                    f"{teacher['full_name']} ({teacher['id']})",
-                    teacher['id']
-                )
-        
-        # If we have items after filtering, select the first one
-        if self.teacher_combo.count() > 0:
-            self.teacher_combo.setCurrentIndex(0)
 
     def filter_classes(self, search_text):
         """Filter the classes dropdown list based on search text"""
-        self.class_combo.clear()
         search_text = search_text.lower()
         
-        for class_item in self.all_classes:
-            if search_text in class_item['value'].lower():
-                self.class_combo.addItem(class_item['value'])
+        self._set_class_items([
+            label for label, key in zip(self._class_labels, self._class_keys)
+            if search_text in key
+        ])
         
         if self.class_combo.count() > 0:
             self.class_combo.setCurrentIndex(0)
 
+    def _set_class_items(self, labels):
+        """Replace the class combo contents with one batched insert"""
+        combo = self.class_combo
+        combo.setUpdatesEnabled(False)
+        try:
+            # The blocker restores the previous signal state instead of forcing it back on
+            with QSignalBlocker(combo):
+                combo.clear()
+                combo.addItems(labels)
+        finally:
+            combo.setUpdatesEnabled(True)
+
     def fetch_student_schedule(self):
         """Fetch student schedule with selected parameters"""
+        if 'student_crawl' in self._running_jobs:
+            return  # A fetch is already in progress
+        
         year_study = self.student_year_combo.currentText()
         term_id = self.student_term_combo.currentText()
         class_id = self.class_combo.currentText()
@@ -641,35 +919,32 @@ class MainWindow(QMainWindow):
         self.student_output.clear()
         self.student_progress.setValue(0)
         
-        # Create and start student crawler worker
-        from student_schedule_crawler import StudentScheduleCrawler
-        crawler = StudentScheduleCrawler()
-        crawler.year_study = year_study
-        crawler.term_id = term_id
-        crawler.class_id = class_id
+        # Generate filename with current date
+        filename = f"student_schedule_{datetime.now().strftime('%Y%m%d')}.json"
         
-        try:
-            schedule = crawler.fetch_schedule(week)
-            self.handle_student_crawler_result(schedule)
-        except Exception as e:
-            self.handle_student_crawler_error(str(e))
+        # Create and start student crawler worker
+        self.student_crawler_worker = StudentCrawlerWorker(year_study, term_id, class_id, week, filename)
+        self.student_crawler_worker.signals.finished.connect(self.handle_student_crawler_result)
+        self.student_crawler_worker.signals.error.connect(self.handle_student_crawler_error)
+        self.student_crawler_worker.signals.progress.connect(self.update_student_progress)
+        self.student_crawler_worker.signals.progress_pct.connect(
+            lambda pct: self.set_progress_value(self.student_progress, pct))
+        self._start_worker('student_crawl', self.student_crawler_worker)
+
+    def update_student_progress(self, message):
+        """Display student crawling status messages"""
+        self.student_output.append(message)
 
-    def handle_student_crawler_result(self, schedule):
-        """Process and display the crawled student schedule data"""
+    def handle_student_crawler_result(self, schedule, filename):
+        """Process and display the crawled student schedule data already saved by the worker"""
         try:
             # Store the current schedule
             self.current_student_schedule = schedule
+            self._ics_cache.clear()
             
-            # Enable the export button
+            # Enable the export and raw JSON buttons
             self.student_export_ics_button.setEnabled(True)
-            
-            # Generate filename with current date
-            current_date = datetime.now().strftime("%Y%m%d")
-            filename = f'student_schedule_{current_date}.json'
-            
-            # Save to JSON file
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(schedule, f, ensure_ascii=False, indent=2)
+            self.student_show_json_button.setEnabled(True)
             
             # Update table with schedule data
             self.update_student_schedule_table(schedule)
@@ -683,13 +958,12 @@ class MainWindow(QMainWindow):
             )
             self.student_metadata_label.setText(metadata_text)
             
-            # Display full schedule in output area
-            self.student_output.setText(json.dumps(schedule, ensure_ascii=False, indent=2))
             self.student_progress.setValue(100)
-            QMessageBox.information(self, "Success", f"Schedule saved to {filename}")
+            self.statusBar().showMessage(f"Schedule saved to {filename}", 5000)
         except Exception as e:
             self.current_student_schedule = None
             self.student_export_ics_button.setEnabled(False)
+            self.student_show_json_button.setEnabled(False)
             QMessageBox.critical(self, "Error", f"Failed to save schedule: {str(e)}")
         finally:
             self.student_fetch_button.setEnabled(True)
@@ -698,106 +972,68 @@ class MainWindow(QMainWindow):
         """Handle and display any errors that occur during student schedule crawling"""
         self.current_student_schedule = None
         self.student_export_ics_button.setEnabled(False)
+        self.student_show_json_button.setEnabled(False)
         self.student_output.setText(f"Error: {error_msg}")
         self.student_progress.setValue(0)
         self.student_fetch_button.setEnabled(True)
         QMessageBox.critical(self, "Error", error_msg)
-        self.student_table.setRowCount(0)
+        self.student_model.clear()
 
     def update_student_schedule_table(self, schedule):
         """Update the UI table with the fetched student schedule data"""
         schedule_data = schedule.get('schedule', {})
-        all_sessions = []
-        
-        # Collect all sessions from the schedule
-        for day, periods in schedule_data.items():
-            for period_type in ['morning', 'afternoon', 'evening']:
-                for session in periods.get(period_type, []):
-                    if session:  # Check if session exists
-                        time_str = f"{day} ({session['time_begin']}-{session['time_end']})"
-                        all_sessions.append({
-                            'time': time_str,
-                            'subject': session['subject'],
-                            'room': session['room'],
-                            'content': (f"Teacher: {session['teacher_name']}\n"
-                                      f"Code: {session['class_code']}\n"
-                                      f"Period: {session['period']}")
-                        })
-
-        # Update table
-        self.student_table.setRowCount(len(all_sessions))
-        for row, session in enumerate(all_sessions):
-            self.student_table.setItem(row, 0, QTableWidgetItem(session['time']))
-            self.student_table.setItem(row, 1, QTableWidgetItem(session['subject']))
-            self.student_table.setItem(row, 2, QTableWidgetItem(session['room']))
-            self.student_table.setItem(row, 3, QTableWidgetItem(session['content']))
-            
-            # Make cells read-only
-            for col in range(4):
-                item = self.student_table.item(row, col)
-                if item:
-                    item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        
+        # Build each row directly in column order, without an intermediate dict
+        rows = [
+            student_row(day, session)
+            for day, periods in schedule_data.items()
+            for period_type in PERIOD_TYPES
+            for session in periods.get(period_type, ())
+            if session
+        ]
 
-        # Adjust row heights to content
-        for row in range(self.student_table.rowCount()):
-            self.student_table.resizeRowToContents(row)
+        # Update model with a single reset; the view only renders visible cells
+        self.student_model.set_sessions(*(zip(*rows) if rows else ((),) * 4))
 
     def export_current_student_to_ics(self):
         """Export currently loaded student schedule data to ICS format"""
         if not self.current_student_schedule:
             QMessageBox.warning(self, "Warning", "No student schedule data available")
             return
+        if 'student_ics' in self._running_jobs:
+            return  # An export is already in progress
         
         self.student_export_ics_button.setEnabled(False)
         self.student_progress.setValue(0)
         
-        # Create a new worker for ICS export
+        # Create a new worker for ICS export using the student-specific exporter
         from student_ics_exporter import StudentICSExporter
-        exporter = StudentICSExporter()  # Create StudentICSExporter instance
-        self.student_ics_worker = ICSWorker(None)
-        self.student_ics_worker.finished.connect(self.handle_student_ics_result)
-        self.student_ics_worker.error.connect(self.handle_student_ics_error)
-        self.student_ics_worker.progress.connect(self.update_student_ics_progress)
-        
-        try:
-            # Use StudentICSExporter's methods directly
-            ics_content = exporter.create_ics_content_from_data(self.current_student_schedule)
-            self.student_ics_worker.finished.emit(ics_content)
-        except Exception as e:
-            self.student_ics_worker.error.emit(str(e))
+        self.student_ics_worker = self._make_ics_worker(
+            self._ics_output_path("student_schedule"),
+            self.current_student_schedule,
+            exporter_cls=StudentICSExporter
+        )
+        self.student_ics_worker.signals.finished.connect(self.handle_student_ics_result)
+        self.student_ics_worker.signals.error.connect(self.handle_student_ics_error)
+        self.student_ics_worker.signals.progress.connect(self.update_student_ics_progress)
+        self.student_ics_worker.signals.progress_pct.connect(
+            lambda pct: self.set_progress_value(self.student_progress, pct))
+        self._start_worker('student_ics', self.student_ics_worker)
 
-    def handle_student_ics_result(self, ics_content):
-        """Process and save the generated student ICS content"""
+    def handle_student_ics_result(self, full_path, result):
+        """Display the student ICS content saved by the worker"""
+        ics_preview, _ = result
         try:
-            # Generate filename
-            output_file = f"student_schedule_{datetime.now().strftime('%Y%m%d')}.ics"
-            
-            # Save ICS file with full path
-            current_dir = os.getcwd()
-            full_path = os.path.join(current_dir, output_file)
+            output_file = os.path.basename(full_path)
             
-            with open(full_path, 'w', encoding='utf-8') as f:
-                f.write(ics_content)
+            # Store the last ICS file path
+            self.last_ics_file = full_path
+            self.open_location_button.setEnabled(True)
             
             # Display in output area
-            self.student_output.setText(ics_content)
+            self.student_output.setPlainText(ics_preview[:PREVIEW_LIMIT])
             self.student_progress.setValue(100)
-            
-            # Create result message box with option to open location
-            msg_box = QMessageBox()
-            msg_box.setWindowTitle("Success")
-            msg_box.setText(f"Calendar exported to {output_file}")
-            msg_box.setIcon(QMessageBox.Icon.Information)
-            
-            # Add custom button to open file location
-            open_location_button = msg_box.addButton("Open Location", QMessageBox.ButtonRole.ActionRole)
-            close_button = msg_box.addButton(QMessageBox.StandardButton.Close)
-            
-            msg_box.exec()
-            
-            # Handle button click
-            if msg_box.clickedButton() == open_location_button:
-                self.open_file_location(full_path)
+            self.statusBar().showMessage(f"Calendar exported to {output_file}", 5000)
                 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save ICS file: {str(e)}")
@@ -812,11 +1048,8 @@ class MainWindow(QMainWindow):
         QMessageBox.critical(self, "Error", error_msg)
 
     def update_student_ics_progress(self, message):
-        """Update the progress bar and display student ICS export status messages"""
+        """Display student ICS export status messages"""
         self.student_output.append(message)
-        # Simulate progress
-        current = self.student_progress.value()
-        self.student_progress.setValue(min(current + 45, 90))
 
     def setup_ics_tab(self, layout):
         """Initialize and setup the ICS export tab"""
@@ -836,6 +1069,12 @@ class MainWindow(QMainWindow):
         self.export_button.clicked.connect(self.export_to_ics)
         layout.addWidget(self.export_button)
         
+        # Open the folder of the most recent export (replaces the modal success dialog)
+        self.open_location_button = QPushButton("Open Last Export Location")
+        self.open_location_button.setEnabled(False)
+        self.open_location_button.clicked.connect(lambda: self.open_file_location(self.last_ics_file))
+        layout.addWidget(self.open_location_button)
+        
         # Progress bar
         self.ics_progress = QProgressBar()
         self.ics_progress.setTextVisible(True)
@@ -860,11 +1099,11 @@ def main():
         'weeks.json': [{'value': 1, 'label': 1}]
     }
     
+    # One directory listing instead of a stat per file
+    existing = set(os.listdir('config'))
     for filename, default_data in config_files.items():
-        config_file = Path('config') / filename
-        if not config_file.exists():
-            with open(config_file, 'w', encoding='utf-8') as f:
-                json.dump(default_data, f, ensure_ascii=False, indent=2)
+        if filename not in existing:
+            (Path('config') / filename).write_bytes(json_utils.dumps(default_data, indent=True))
     
     try:
         app = QApplication(sys.argv)
@@ -9,17 +9,39 @@ import pickle
 
 SCOPES = ['https://www.googleapis.com/auth/calendar']
 
+# Access and refresh tokens; older versions pickled them to LEGACY_TOKEN_FILE
+TOKEN_FILE = 'token.json'
+LEGACY_TOKEN_FILE = 'token.pickle'
+
+# The Calendar API accepts at most 50 calls in one batch request
+BATCH_LIMIT = 50
+
+# Maps "summary|start|end" of every synced event to its event id, so re-syncs skip them
+SYNCED_EVENTS_FILE = 'synced_events.json'
+
 class GoogleCalendarSync:
+    # Credentials and API client shared by every instance; the client refreshes expired tokens itself
+    _creds = None
+    _service = None
+
     def __init__(self):
-        self.creds = self._get_credentials()
-        self.service = build('calendar', 'v3', credentials=self.creds)
+        if GoogleCalendarSync._service is None:
+            GoogleCalendarSync._creds = self._get_credentials()
+            # The discovery document bundled with the client library avoids a network fetch
+            GoogleCalendarSync._service = build('calendar', 'v3', credentials=GoogleCalendarSync._creds,
+                                                static_discovery=True)
+        self.creds = GoogleCalendarSync._creds
+        self.service = GoogleCalendarSync._service
         
     def _get_credentials(self):
         creds = None
-        # The file token.pickle stores the user's access and refresh tokens
-        if os.path.exists('token.pickle'):
-            with open('token.pickle', 'rb') as token:
+        save = False
+        if os.path.exists(TOKEN_FILE):
+            creds = Credentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
+        elif os.path.exists(LEGACY_TOKEN_FILE):
+            with open(LEGACY_TOKEN_FILE, 'rb') as token:
                 creds = pickle.load(token)
+            save = True  # Migrate to the JSON token file
                 
         # If there are no (valid) credentials available, let the user log in
         if not creds or not creds.valid:
@@ -29,18 +51,23 @@ class GoogleCalendarSync:
                 flow = InstalledAppFlow.from_client_secrets_file(
                     'credentials.json', SCOPES)
                 creds = flow.run_local_server(port=0)
-            # Save the credentials for the next run
-            with open('token.pickle', 'wb') as token:
-                pickle.dump(creds, token)
+            save = True
+        
+        # Save the credentials for the next run
+        if save:
+            with open(TOKEN_FILE, 'w', encoding='utf-8') as token:
+                token.write(creds.to_json())
         return creds
 
-    def create_event(self, subject, location, start_time, end_time, description):
+    def _build_event(self, subject, location, start_time, end_time, description, date_str=None):
+        """Build the request body for one calendar event"""
         # Convert times to RFC3339 format
-        date_str = datetime.now().strftime("%Y-%m-%d")
+        if date_str is None:
+            date_str = datetime.now().strftime("%Y-%m-%d")
         start_datetime = f"{date_str}T{start_time}:00+07:00"
         end_datetime = f"{date_str}T{end_time}:00+07:00"
         
-        event = {
+        return {
             'summary': subject,
             'location': location,
             'description': description,
@@ -57,6 +84,8 @@ class GoogleCalendarSync:
             },
         }
 
+    def create_event(self, subject, location, start_time, end_time, description):
+        event = self._build_event(subject, location, start_time, end_time, description)
         event = self.service.events().insert(calendarId='primary', body=event).execute()
         print(f'Event created: {event.get("htmlLink")}')
         return event
@@ -81,7 +110,8 @@ class GoogleCalendarSync:
         
         # Calculate dates for each day in the schedule
         base_date = datetime.strptime(schedule_date, "%Y-%m-%d")
-        created_events = []
+        synced = self._load_synced_events()
+        pending = []
         
         for day, sessions in schedule.items():
             # Calculate the actual date for this day
@@ -91,6 +121,9 @@ class GoogleCalendarSync:
             
             for period in ['morning', 'afternoon', 'evening']:
                 for session in sessions[period]:
+                    if not session:  # Skip empty sessions
+                        continue
+                    
                     description = (
                         f"Mã lớp: {session['class_code']}\n"
                         f"Lớp: {session['class_name']}\n"
@@ -98,17 +131,62 @@ class GoogleCalendarSync:
                         f"Đã dạy: {session['taught_lessons']}"
                     )
                     
-                    event = self.create_event(
+                    event = self._build_event(
                         subject=session['subject'],
                         location=session['room'],
                         start_time=session['time_begin'],
                         end_time=session['time_end'],
-                        description=description
+                        description=description,
+                        date_str=date_str
                     )
-                    created_events.append(event)
+                    key = self._event_key(event)
+                    if key not in synced:  # Already inserted by an earlier sync
+                        pending.append((key, event))
+        
+        # Save even when a batch fails, so events created by earlier batches are not inserted again
+        try:
+            return self._insert_events(pending, synced)
+        finally:
+            self._save_synced_events(synced)
+
+    def _insert_events(self, pending, synced):
+        """Insert events with batch requests, recording each created event in synced"""
+        created_events = []
+        
+        for start in range(0, len(pending), BATCH_LIMIT):
+            chunk = pending[start:start + BATCH_LIMIT]
+            
+            def callback(request_id, response, exception):
+                key = chunk[int(request_id)][0]
+                if exception is not None:
+                    print(f'Failed to create event {key}: {exception}')
+                    return
+                synced[key] = response['id']
+                created_events.append(response)
+                print(f'Event created: {response.get("htmlLink")}')
+            
+            batch = self.service.new_batch_http_request(callback=callback)
+            for index, (key, event) in enumerate(chunk):
+                batch.add(self.service.events().insert(calendarId='primary', body=event),
+                          request_id=str(index))
+            batch.execute()
         
         return created_events
 
+    def _event_key(self, event):
+        """Identify an event by its summary and time range"""
+        return f"{event['summary']}|{event['start']['dateTime']}|{event['end']['dateTime']}"
+
+    def _load_synced_events(self):
+        if os.path.exists(SYNCED_EVENTS_FILE):
+            with open(SYNCED_EVENTS_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return {}
+
+    def _save_synced_events(self, synced):
+        with open(SYNCED_EVENTS_FILE, 'w', encoding='utf-8') as f:
+            json.dump(synced, f, ensure_ascii=False, indent=2)
+
 def main():
     calendar = GoogleCalendarSync()
     # Use the most recent schedule file
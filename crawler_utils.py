@@ -0,0 +1,15 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+# Week header patterns shared by both crawlers, e.g. "Tuần 10: từ ngày 13/01/2025 đến ngày 19/01/2025"
+DATE_RE = re.compile(r'\d{2}/\d{2}/\d{4}')
+WEEK_NUM_RE = re.compile(r'\d+')
+
+class MultiWeekMixin:
+    """Adds concurrent multi-week fetching to a crawler that defines fetch_schedule(week)"""
+
+    def fetch_schedules(self, weeks: List[int], max_workers: int = 8) -> List[Dict]:
+        """Fetch several weeks concurrently over the shared session; results keep the order of `weeks`"""
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.fetch_schedule, weeks))
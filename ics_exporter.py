@@ -1,19 +1,28 @@
 from datetime import datetime, timedelta
-import json
+from itertools import count
+import json_utils
 import uuid
 
+# Offset of each Vietnamese weekday name from the Monday that starts the week
+DAY_OFFSETS = {
+    'Thứ 2': 0, 'Thứ 3': 1, 'Thứ 4': 2,
+    'Thứ 5': 3, 'Thứ 6': 4, 'Thứ 7': 5,
+    'Chủ nhật': 6
+}
+
 class ICSExporter:
+    prodid = "-//DalatCoder//Schedule Exporter//EN"
+
     def __init__(self):
         self.timezone = "Asia/Ho_Chi_Minh"
         
-    def _generate_uid(self):
-        return str(uuid.uuid4()).replace("-", "")
+    def _generate_uids(self):
+        """Yield event UIDs from one random base per export plus a counter"""
+        base = uuid.uuid4().hex
+        return (f"{base}-{i:04x}@dalatcoder" for i in count())
         
-    def _format_datetime(self, date_str: str, time_str: str) -> str:
-        """Convert date and time to iCal format"""
-        # Convert DD/MM/YYYY to YYYYMMDD
-        date_parts = date_str.split('/')
-        formatted_date = f"{date_parts[2]}{date_parts[1]}{date_parts[0]}"
+    def _format_datetime(self, formatted_date: str, time_str: str) -> str:
+        """Combine an already formatted YYYYMMDD date and an HH:MM time into iCal format"""
         # Convert HH:MM to HHMMSS
         formatted_time = time_str.replace(":", "") + "00"
         return f"{formatted_date}T{formatted_time}"
@@ -27,51 +36,84 @@ class ICSExporter:
             raise Exception(f"Failed to create ICS content: {str(e)}")
 
     def create_ics_content(self, schedule_file):
-        """Create ICS content from schedule JSON file"""
+        """Create ICS content from a schedule JSON file, or from an already loaded schedule dict"""
         try:
-            with open(schedule_file, 'r', encoding='utf-8') as f:
-                schedule_data = json.load(f)
-            return self._generate_ics_content(schedule_data)
+            return self._generate_ics_content(self._load_schedule(schedule_file))
         except Exception as e:
             raise Exception(f"Failed to create ICS content: {str(e)}")
 
+    def iter_ics_lines(self, schedule_file=None, events=None):
+        """Yield ICS lines (without line endings) one at a time so they can be streamed to disk;
+        events from iter_events can be passed instead of a schedule to skip rebuilding them"""
+        try:
+            if events is None:
+                events = self.iter_events(schedule_file)
+            yield from self._iter_calendar_lines(events)
+        except Exception as e:
+            raise Exception(f"Failed to create ICS content: {str(e)}")
+
+    def iter_events(self, schedule_file):
+        """Yield the properties of each event, without the export-time DTSTAMP"""
+        return self._iter_events(self._load_schedule(schedule_file))
+
+    def _load_schedule(self, schedule_file):
+        """Return the schedule dict, reading it from disk when given a path"""
+        if isinstance(schedule_file, dict):
+            return schedule_file
+        with open(schedule_file, 'rb') as f:
+            return json_utils.loads(f.read())
+
     def _generate_ics_content(self, schedule_data):
         """Common method to generate ICS content from schedule data"""
+        return "\r\n".join(self._iter_calendar_lines(self._iter_events(schedule_data)))
+
+    def _iter_calendar_lines(self, events):
+        """Wrap event properties into a calendar, stamping every event with the current time"""
+        yield "BEGIN:VCALENDAR"
+        yield f"PRODID:{self.prodid}"
+        yield "VERSION:2.0"
+        yield "CALSCALE:GREGORIAN"
+        yield "METHOD:PUBLISH"
+        yield f"X-WR-TIMEZONE:{self.timezone}"
+        
+        dtstamp = f"DTSTAMP:{datetime.now().strftime('%Y%m%dT%H%M%SZ')}"
+        for uid, *properties in events:
+            yield "BEGIN:VEVENT"
+            yield uid
+            yield dtstamp
+            yield from properties
+            yield "STATUS:CONFIRMED"
+            yield "SEQUENCE:0"
+            yield "END:VEVENT"
+        
+        # Close the calendar
+        yield "END:VCALENDAR"
+
+    def _iter_events(self, schedule_data):
+        """Generate the UID, time, summary, location and description lines of each session"""
         metadata = schedule_data['metadata']
         schedule = schedule_data['schedule']
         
-        # Start building ICS content
-        ics_lines = [
-            "BEGIN:VCALENDAR",
-            "PRODID:-//DalatCoder//Schedule Exporter//EN",
-            "VERSION:2.0",
-            "CALSCALE:GREGORIAN",
-            "METHOD:PUBLISH",
-            f"X-WR-TIMEZONE:{self.timezone}"
-        ]
-        
-        # Map Vietnamese days to their dates
-        day_map = {
-            'Thứ 2': 0, 'Thứ 3': 1, 'Thứ 4': 2,
-            'Thứ 5': 3, 'Thứ 6': 4, 'Thứ 7': 5,
-            'Chủ nhật': 6
-        }
+        # Property prefixes shared by every event
+        dtstart = f"DTSTART;TZID={self.timezone}:"
+        dtend = f"DTEND;TZID={self.timezone}:"
         
         base_date = datetime.strptime(metadata['start_date'], "%d/%m/%Y")
+        uids = self._generate_uids()
         
         # Create events for each session
         for day, sessions in schedule.items():
             # Calculate the actual date for this day
-            current_date = base_date + timedelta(days=day_map[day])
-            current_date_str = current_date.strftime("%d/%m/%Y")
+            current_date = base_date + timedelta(days=DAY_OFFSETS[day])
+            event_date = current_date.strftime("%Y%m%d")
             
             for period in ['morning', 'afternoon', 'evening']:
                 for session in sessions[period]:
                     if not session:  # Skip empty sessions
                         continue
                         
-                    start_dt = self._format_datetime(current_date_str, session['time_begin'])
-                    end_dt = self._format_datetime(current_date_str, session['time_end'])
+                    start_dt = self._format_datetime(event_date, session['time_begin'])
+                    end_dt = self._format_datetime(event_date, session['time_end'])
                     
                     description = (
                         f"Mã lớp: {session['class_code']}\\n"
@@ -80,26 +122,20 @@ class ICSExporter:
                         f"Đã dạy: {session['taught_lessons']}"
                     )
                     
-                    event_lines = [
-                        "BEGIN:VEVENT",
-                        f"UID:{self._generate_uid()}",
-                        f"DTSTAMP:{datetime.now().strftime('%Y%m%dT%H%M%SZ')}",
-                        f"DTSTART;TZID={self.timezone}:{start_dt}",
-                        f"DTEND;TZID={self.timezone}:{end_dt}",
+                    yield (
+                        f"UID:{next(uids)}",
+                        dtstart + start_dt,
+                        dtend + end_dt,
                         f"SUMMARY:{session['subject']}",
                         f"LOCATION:{session['room']}",
-                        f"DESCRIPTION:{description}",
-                        "STATUS:CONFIRMED",
-                        "SEQUENCE:0",
-                        "END:VEVENT"
-                    ]
-                    
-                    ics_lines.extend(event_lines)
-        
-        # Close the calendar
-        ics_lines.append("END:VCALENDAR")
-        
-        return "\r\n".join(ics_lines)
+                        f"DESCRIPTION:{description}"
+                    )
+
+def write_ics(path, content):
+    """Save ICS content as UTF-8"""
+    # Encode once and write the bytes in a single call; binary mode also keeps the CRLF line endings intact
+    with open(path, 'wb') as f:
+        f.write(content.encode('utf-8'))
 
 def main():
     exporter = ICSExporter()
@@ -119,8 +155,7 @@ def main():
     
     # Save to file
     output_file = f"teaching_schedule_{datetime.now().strftime('%Y%m%d')}.ics"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(ics_content)
+    write_ics(output_file, ics_content)
     
     print(f"Schedule has been exported to {output_file}")
 
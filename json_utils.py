@@ -0,0 +1,21 @@
+import json
+
+# orjson is much faster than the standard library; keep working without the wheel
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def dumps(obj, indent: bool = False) -> bytes:
+    """Serialize an object to UTF-8 JSON bytes, indented by two spaces if requested"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def loads(data):
+    """Parse JSON from bytes or str"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
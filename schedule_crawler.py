@@ -2,16 +2,37 @@
 # https://qlgd.dlu.edu.vn/public/DrawingProfessorSchedule?YearStudy=2024-2025&TermID=HK02&Week=3&ProfessorID=011.031.00125&t=0.780616904287754
 
 import requests
-import json
+import json_utils
+from crawler_utils import DATE_RE, WEEK_NUM_RE, MultiWeekMixin
+import re
+import html
 from typing import Dict
 from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
-from dataclasses import asdict, dataclass
-from typing import Dict, List, Optional
+from pathlib import Path
+from bs4 import BeautifulSoup, SoupStrainer
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
 import unicodedata
 
+# lxml builds the tree in C and is several times faster than html.parser; it is a required
+# dependency, like in the student crawler and teacher extractor
+HTML_PARSER = 'lxml'
+
 BASE_URL = "https://qlgd.dlu.edu.vn/public/DrawingProfessorSchedule"
 
+DAYS = ['Thứ 2', 'Thứ 3', 'Thứ 4', 'Thứ 5', 'Thứ 6', 'Thứ 7', 'Chủ nhật']
+
+# The schedule page is a fixed template: three <td> cells (morning, afternoon, evening)
+# per day, each holding seven plain-text <span> fields when a class is scheduled
+_TD_RE = re.compile(r'<td[^>]*>(.*?)</td>', re.S)
+_SPAN_RE = re.compile(r'<span[^>]*>([^<]*)</span>')
+
+# Only the bold header div is needed for the week info, so only it is turned into a tree
+_HEADER_STRAINER = SoupStrainer('div', style='font-weight:bold')
+
+# The server is queried with verify=False; silence the warning once instead of per request
+requests.packages.urllib3.disable_warnings(requests.packages.urllib3.exceptions.InsecureRequestWarning)
+
 @dataclass
 class TimeSlot:
     start_time: str
@@ -44,16 +65,16 @@ class WeekInfo:
     end_date: str
     professor_name: str
 
-class ScheduleCrawler:
+class ScheduleCrawler(MultiWeekMixin):
     def __init__(self):
         self.year_study = "2024-2025"
         self.term_id = "HK02"
         self.professor_id = "011.031.00125"
         self.period_map = self._initialize_period_map()
+        self.session = requests.Session()  # Keep-alive connection reused across fetches
     
     def build_url(self, week: int) -> str:
-        timestamp = datetime.now().timestamp()
-        return f"{BASE_URL}?YearStudy={self.year_study}&TermID={self.term_id}&Week={week}&ProfessorID={self.professor_id}&t={timestamp}"
+        return f"{BASE_URL}?YearStudy={self.year_study}&TermID={self.term_id}&Week={week}&ProfessorID={self.professor_id}"
     
     def _initialize_period_map(self) -> Dict[int, TimeSlot]:
         """Initialize mapping of period numbers to actual times"""
@@ -111,15 +132,26 @@ class ScheduleCrawler:
             return 0, 0
 
     def _parse_class_cell(self, cell) -> Optional[ClassSession]:
-        if not cell.find('span'):
-            return None
-            
+        # A single traversal; empty cells simply have no spans
         spans = cell.find_all('span')
         if len(spans) < 7:  # Check if we have all required spans
             return None
-            
+        
+        return self._session_from_fields([span.text for span in spans[:7]])
+
+    def _parse_cell_html(self, cell_html: str) -> Optional[ClassSession]:
+        """Parse one raw <td> body, using the tree parser only for unexpected markup"""
+        fields = _SPAN_RE.findall(cell_html)
+        if len(fields) >= 7:
+            return self._session_from_fields([html.unescape(field) for field in fields[:7]])
+        if '<span' not in cell_html:
+            return None  # Empty slot
+        return self._parse_class_cell(BeautifulSoup(cell_html, HTML_PARSER))
+
+    def _session_from_fields(self, fields: List[str]) -> Optional[ClassSession]:
+        """Build a session from the seven span texts of a cell, in page order"""
         try:
-            period_str = spans[3].text.replace('-Tiết:', '').strip() if spans[3] else ""
+            period_str = fields[3].replace('-Tiết:', '').strip()
             period_begin, period_end = self._parse_period(period_str)
             
             # Get time slots for the periods
@@ -131,35 +163,53 @@ class ScheduleCrawler:
                 time_end = self.period_map[period_end].end_time
             
             return ClassSession(
-                subject=spans[0].text.strip() if spans[0] else "",
-                class_code=spans[1].text.replace('-Mã LHP:', '').strip() if spans[1] else "",
-                class_name=spans[2].text.replace('-Lớp:', '').strip() if spans[2] else "",
+                subject=fields[0].strip(),
+                class_code=fields[1].replace('-Mã LHP:', '').strip(),
+                class_name=fields[2].replace('-Lớp:', '').strip(),
                 period=period_str,
                 period_begin=period_begin,
                 period_end=period_end,
                 time_begin=time_begin,
                 time_end=time_end,
-                taught_lessons=spans[4].text.replace('-Đã dạy:', '').strip() if spans[4] else "",
-                room=spans[5].text.replace('-Phòng :', '').strip() if spans[5] else "",
-                content=spans[6].text.replace('-Nội dung :', '').strip() if spans[6] else ""
+                taught_lessons=fields[4].replace('-Đã dạy:', '').strip(),
+                room=fields[5].replace('-Phòng :', '').strip(),
+                content=fields[6].replace('-Nội dung :', '').strip()
             )
         except Exception as e:
             print(f"Error parsing cell: {e}")
             return None
 
     def parse_schedule(self, html_content: str) -> Dict[str, DaySchedule]:
-        soup = BeautifulSoup(html_content, 'html.parser')
+        """Parse the weekly table with one regex pass over the raw HTML"""
+        cells = _TD_RE.findall(html_content)
+        if not cells or len(cells) % 3:
+            return self._parse_schedule_tree(html_content)  # Not the layout we know
+        
+        schedule = {}
+        for day, start in zip(DAYS, range(0, len(cells), 3)):
+            morning, afternoon, evening = (self._parse_cell_html(cell) for cell in cells[start:start + 3])
+            schedule[day] = DaySchedule(
+                morning=[morning] if morning else [],
+                afternoon=[afternoon] if afternoon else [],
+                evening=[evening] if evening else []
+            )
+        
+        return schedule
+
+    def _parse_schedule_tree(self, html_content: str) -> Dict[str, DaySchedule]:
+        """Parse the weekly table with BeautifulSoup; slower but tolerant of layout changes"""
+        soup = BeautifulSoup(html_content, HTML_PARSER)
         schedule = {}
         
-        rows = soup.find('table').find_all('tr')[1:]  # Skip header row
-        days = ['Thứ 2', 'Thứ 3', 'Thứ 4', 'Thứ 5', 'Thứ 6', 'Thứ 7', 'Chủ nhật']
+        rows = soup.select_one('table').select('tr')[1:]  # Skip header row
         
-        for row, day in zip(rows, days):
+        for row, day in zip(rows, DAYS):
             cells = row.find_all('td')
+            morning, afternoon, evening = (self._parse_class_cell(cell) for cell in cells[:3])
             schedule[day] = DaySchedule(
-                morning=[self._parse_class_cell(cells[0])] if self._parse_class_cell(cells[0]) else [],
-                afternoon=[self._parse_class_cell(cells[1])] if self._parse_class_cell(cells[1]) else [],
-                evening=[self._parse_class_cell(cells[2])] if self._parse_class_cell(cells[2]) else []
+                morning=[morning] if morning else [],
+                afternoon=[afternoon] if afternoon else [],
+                evening=[evening] if evening else []
             )
         
         return schedule
@@ -171,7 +221,7 @@ class ScheduleCrawler:
 
     def _extract_week_info(self, html_content: str) -> WeekInfo:
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = BeautifulSoup(html_content, HTML_PARSER, parse_only=_HEADER_STRAINER)
             header_div = soup.find('div', style='font-weight:bold')
             spans = header_div.find_all('span')
             
@@ -179,14 +229,11 @@ class ScheduleCrawler:
             week_span = spans[0].text.strip()
             professor_span = spans[1].text.strip()
             
-            # print(f"Raw week span: {week_span}")
-            
             # Extract week number from original text
-            week_number = int(''.join(filter(str.isdigit, week_span.split(':')[0])))
+            week_number = int(WEEK_NUM_RE.search(week_span.split(':', 1)[0]).group())
             
             # Extract dates using regex
-            import re
-            dates = re.findall(r'\d{2}/\d{2}/\d{4}', week_span)
+            dates = DATE_RE.findall(week_span)
             if len(dates) >= 2:
                 start_date = dates[0]
                 end_date = dates[1]
@@ -196,14 +243,12 @@ class ScheduleCrawler:
             # Extract professor name
             professor = professor_span.replace('Thời khóa biểu giảng viên:', '').strip()
             
-            result = WeekInfo(
+            return WeekInfo(
                 week_number=week_number,
                 start_date=start_date,
                 end_date=end_date,
                 professor_name=professor
             )
-            print(f"Successfully parsed: {result}")
-            return result
             
         except Exception as e:
             print(f"Error parsing header: {str(e)}")
@@ -216,29 +261,36 @@ class ScheduleCrawler:
 
     def to_json_structure(self, schedule: Dict[str, DaySchedule], html_content: str) -> dict:
         week_info = self._extract_week_info(html_content)
-        print(week_info)
         
+        # The dataclasses hold only flat str/int fields, so their instance dicts
+        # serialize as-is without asdict's recursive deep copy
         return {
-            "metadata": asdict(week_info),
+            "metadata": vars(week_info),
             "schedule": {
                 day: {
-                    "morning": [asdict(session) for session in day_schedule.morning],
-                    "afternoon": [asdict(session) for session in day_schedule.afternoon],
-                    "evening": [asdict(session) for session in day_schedule.evening]
+                    "morning": [vars(session) for session in day_schedule.morning],
+                    "afternoon": [vars(session) for session in day_schedule.afternoon],
+                    "evening": [vars(session) for session in day_schedule.evening]
                 }
                 for day, day_schedule in schedule.items()
             }
         }
 
-    def fetch_schedule(self, week: int) -> Dict:
+    def fetch_schedule(self, week: int, progress_callback: Optional[Callable[[int], None]] = None) -> Dict:
+        """Fetch and parse one week; `progress_callback` receives a percentage at each stage"""
+        report = progress_callback or (lambda pct: None)
         url = self.build_url(week)
         try:
-            response = requests.get(url, verify=False)
-            requests.packages.urllib3.disable_warnings(requests.packages.urllib3.exceptions.InsecureRequestWarning)
+            report(10)
+            response = self.session.get(url, verify=False)
             
             if response.status_code == 200:
+                report(50)
                 schedule = self.parse_schedule(response.text)
-                return self.to_json_structure(schedule, response.text)
+                report(70)
+                result = self.to_json_structure(schedule, response.text)
+                report(80)
+                return result
             raise Exception(f"Failed to fetch schedule: {response.status_code}")
         except requests.exceptions.RequestException as req_err:
             print(f"Request Error occurred: {req_err}")
@@ -252,9 +304,8 @@ def main():
     current_date = datetime.now().strftime("%Y%m%d")
     filename = f'schedule_{current_date}.json'
     
-    # Save to JSON file with pretty printing
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(schedule, f, ensure_ascii=False, indent=2)
+    # Save to JSON file with pretty printing, serialized to bytes in one pass
+    Path(filename).write_bytes(json_utils.dumps(schedule, indent=True))
     
     print(f"Schedule has been saved to {filename}")
 
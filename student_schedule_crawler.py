@@ -1,103 +1,84 @@
 import re
-import json
+import logging
+import json_utils
+from crawler_utils import DATE_RE, WEEK_NUM_RE, MultiWeekMixin
 import requests
-from bs4 import BeautifulSoup
-from dataclasses import dataclass, asdict
-from datetime import datetime, timedelta
+import lxml.etree
+import lxml.html
+from requests.adapters import HTTPAdapter
+from datetime import datetime
+from pathlib import Path
 from typing import Dict, List, Optional
+from functools import lru_cache
 
-BASE_URL = "https://qlgd.dlu.edu.vn/public/DrawingClassStudentSchedules_Mau2"
-
-@dataclass
-class StudentSession:
-    subject: str
-    class_code: str
-    class_name: str
-    period: str
-    period_begin: int
-    period_end: int
-    time_begin: str
-    time_end: str
-    room: str
-    teacher_name: str
-
-    def to_dict(self):
-        """Convert session to dictionary for JSON serialization"""
-        return {
-            'subject': self.subject,
-            'class_code': self.class_code,
-            'class_name': self.class_name,
-            'period': self.period,
-            'period_begin': self.period_begin,
-            'period_end': self.period_end,
-            'time_begin': self.time_begin,
-            'time_end': self.time_end,
-            'room': self.room,
-            'teacher_name': self.teacher_name
-        }
+# Optional on-disk HTTP cache: repeated fetches of the same week revalidate with
+# ETag/If-Modified-Since instead of downloading the page again
+try:
+    from requests_cache import CachedSession
+except ImportError:
+    CachedSession = None
 
-@dataclass
-class StudentDaySchedule:
-    morning: List[StudentSession]
-    afternoon: List[StudentSession]
-    evening: List[StudentSession]
-
-class StudentScheduleCrawler:
-    def __init__(self):
+BASE_URL = "https://qlgd.dlu.edu.vn/public/DrawingClassStudentSchedules_Mau2"
+HTTP_CACHE_NAME = 'schedule_cache'
+HTTP_CACHE_EXPIRE = 3600  # seconds
+
+logger = logging.getLogger(__name__)
+
+# The server is queried with verify=False; silence the warning once instead of per request
+requests.packages.urllib3.disable_warnings(requests.packages.urllib3.exceptions.InsecureRequestWarning)
+
+# Start and end time of each teaching period. Periods last 45 minutes with 5 minute breaks,
+# plus a 20 minute break after period 3 and a 10 minute break after period 8
+PERIOD_MAP: Dict[int, tuple[str, str]] = {
+    # Morning
+    1: ('07:30', '08:15'), 2: ('08:20', '09:05'), 3: ('09:10', '09:55'),
+    4: ('10:15', '11:00'), 5: ('11:05', '11:50'), 6: ('11:55', '12:40'),
+    # Afternoon
+    7: ('13:00', '13:45'), 8: ('13:50', '14:35'), 9: ('14:45', '15:30'), 10: ('15:35', '16:20'),
+    # Evening
+    11: ('16:40', '17:25'), 12: ('17:30', '18:15'), 13: ('18:20', '19:05'), 14: ('19:10', '19:55')
+}
+UNKNOWN_PERIOD = ('00:00', '00:00')
+
+# Leading field label of a session span, e.g. "- Nhóm: " or "- GV: "
+_LABEL_RE = re.compile(r'^\s*-\s*[^:]+:\s*')
+
+# Compiled once instead of re-parsing the expressions for every page and cell. The last
+# span of a session is often left unclosed, so later sessions end up nested inside it
+# and must be searched as descendants
+_TABLES = lxml.etree.XPath('//table')
+_ROWS = lxml.etree.XPath('.//tr')
+_CELLS = lxml.etree.XPath('.//td')
+_SESSION_BLOCKS = lxml.etree.XPath('.//span | .//hr')
+_HEADER_SPANS = lxml.etree.XPath("//div[@style='font-weight:bold']//span")
+
+class StudentScheduleCrawler(MultiWeekMixin):
+    def __init__(self, http_cache: bool = False):
         self.year_study = "2024-2025"
         self.term_id = "HK02"
         self.class_id = "KTK48A"  # Example class ID
-        self.period_map = self._initialize_period_map()
+        self.period_map = PERIOD_MAP
+        
+        # Keep-alive connections reused across fetches, with room for concurrent week fetches.
+        # Cached pages are served without asking the server until they expire, so only callers
+        # that accept a possibly stale schedule (the CLI) opt into the cache
+        if http_cache and CachedSession is not None:
+            self.session = CachedSession(
+                HTTP_CACHE_NAME,
+                backend='sqlite',
+                expire_after=HTTP_CACHE_EXPIRE
+            )
+        else:
+            self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16))
 
     def build_url(self, week: int) -> str:
-        timestamp = datetime.now().timestamp()
-        return f"{BASE_URL}?YearStudy={self.year_study}&TermID={self.term_id}&Week={week}&ClassStudentID={self.class_id}&t={timestamp}"
+        return f"{BASE_URL}?YearStudy={self.year_study}&TermID={self.term_id}&Week={week}&ClassStudentID={self.class_id}"
 
-    def _initialize_period_map(self) -> Dict[int, tuple]:
-        """Initialize mapping of period numbers to actual times"""
-        periods = {}
-        
-        # Morning periods (1-6)
-        current_time = datetime.strptime("07:30", "%H:%M")  # Start at 7:30
-        for period in range(1, 7):
-            start_time = current_time.strftime("%H:%M")
-            end_time = (current_time + timedelta(minutes=45)).strftime("%H:%M")
-            periods[period] = (start_time, end_time)
-            
-            # Add break time
-            current_time += timedelta(minutes=45)  # Add period duration
-            if period == 3:  # Long break after period 3
-                current_time += timedelta(minutes=20)  # Long break
-            else:
-                current_time += timedelta(minutes=5)  # Short break
-        
-        # Afternoon periods (7-10)
-        current_time = datetime.strptime("13:00", "%H:%M")  # Start at 13:00
-        for period in range(7, 11):
-            start_time = current_time.strftime("%H:%M")
-            end_time = (current_time + timedelta(minutes=45)).strftime("%H:%M")
-            periods[period] = (start_time, end_time)
-            
-            # Add break time
-            current_time += timedelta(minutes=45)  # Add period duration
-            if period == 8:  # Long break after period 8
-                current_time += timedelta(minutes=10)  # Long break
-            else:
-                current_time += timedelta(minutes=5)  # Short break
-        
-        # Evening periods (11-14)
-        current_time = datetime.strptime("16:40", "%H:%M")  # Start at 16:40
-        for period in range(11, 15):
-            start_time = current_time.strftime("%H:%M")
-            end_time = (current_time + timedelta(minutes=45)).strftime("%H:%M")
-            periods[period] = (start_time, end_time)
-            
-            # Only add short breaks between periods
-            current_time += timedelta(minutes=50)  # 45 mins + 5 mins break
-        
-        return periods
-
-    def _parse_period(self, period_str: str) -> tuple[int, int]:
+    # A pure function of the few distinct period strings on a page, so results are cached
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _parse_period(period_str: str) -> tuple[int, int]:
         """Extract begin and end periods from period string like '- Tiết: 1-2'"""
         try:
             # Remove "- Tiết:" prefix and whitespace
@@ -106,27 +87,24 @@ class StudentScheduleCrawler:
                 begin, end = cleaned.split('-')
                 return int(begin), int(end)
             return 0, 0
-        except:
+        except ValueError:
             return 0, 0
 
-    def _parse_class_cell(self, cell) -> List[Optional[StudentSession]]:
-        if not cell.find('span'):
-            return []
-
+    def _parse_class_cell(self, cell) -> List[Dict]:
         # Split content by <hr> tag if exists
         sessions = []
-        subject_blocks = cell.find_all(['hr', 'span'])
+        subject_blocks = _SESSION_BLOCKS(cell)
         
         current_session = []
         for block in subject_blocks:
-            if block.name == 'hr':
+            if block.tag == 'hr':
                 if current_session:
                     session = self._create_session_from_spans(current_session)
                     if session:
                         sessions.append(session)
                 current_session = []
             else:
-                current_session.append(block)
+                current_session.append(block.text_content())
                 
         # Don't forget the last session
         if current_session:
@@ -136,62 +114,71 @@ class StudentScheduleCrawler:
                 
         return sessions if sessions else []
 
-    def _create_session_from_spans(self, spans) -> Optional[StudentSession]:
+    def _create_session_from_spans(self, spans: List[str]) -> Optional[Dict]:
+        """Build a session dict from the text of its spans, in page order: subject, class_code,
+        class_name, period, room and teacher_name as str, period_begin and period_end as int,
+        and time_begin and time_end as 'HH:MM' str"""
         if len(spans) < 6:
             return None
 
         try:
             # Extract period string with "Tiết" prefix
-            period_str = spans[3].text.strip() if spans[3] else ""
+            period_str = spans[3].strip()
             period_begin, period_end = self._parse_period(period_str)
 
             # Get time slots for the periods
-            time_begin = self.period_map[period_begin][0] if period_begin in self.period_map else "00:00"
-            time_end = self.period_map[period_end][1] if period_end in self.period_map else "00:00"
-
-            return StudentSession(
-                subject=spans[0].text.strip(),
-                class_code=spans[1].text.replace('- Nhóm:', '').strip(),
-                class_name=spans[2].text.replace('- Lớp:', '').strip(),
-                period=period_str,
-                period_begin=period_begin,
-                period_end=period_end,
-                time_begin=time_begin,
-                time_end=time_end,
-                room=spans[4].text.replace('- Phòng:', '').strip(),
-                teacher_name=spans[5].text.replace('- GV:', '').strip()
-            )
-        except Exception as e:
-            print(f"Error parsing spans: {e}")
+            time_begin = self.period_map.get(period_begin, UNKNOWN_PERIOD)[0]
+            time_end = self.period_map.get(period_end, UNKNOWN_PERIOD)[1]
+
+            return {
+                'subject': spans[0].strip(),
+                'class_code': _LABEL_RE.sub('', spans[1], 1).strip(),
+                'class_name': _LABEL_RE.sub('', spans[2], 1).strip(),
+                'period': period_str,
+                'period_begin': period_begin,
+                'period_end': period_end,
+                'time_begin': time_begin,
+                'time_end': time_end,
+                'room': _LABEL_RE.sub('', spans[4], 1).strip(),
+                'teacher_name': _LABEL_RE.sub('', spans[5], 1).strip()
+            }
+        except (IndexError, ValueError) as e:
+            logger.debug("Error parsing spans: %s", e)
             return None
 
     def fetch_schedule(self, week: int) -> Dict:
         url = self.build_url(week)
-        response = requests.get(url, verify=False)
-        requests.packages.urllib3.disable_warnings()
+        response = self.session.get(url, verify=False, timeout=10)
 
         if response.status_code != 200:
             raise Exception(f"Failed to fetch schedule: {response.status_code}")
 
-        schedule = self.parse_schedule(response.text)
-        metadata = self._extract_metadata(response.text)
-        
+        # Parse the raw body instead of decoding it to a str first. requests reports ISO-8859-1
+        # for text/html without a charset, so only trust a charset the server actually declared
+        declared = 'charset' in response.headers.get('Content-Type', '').lower()
+        parser = lxml.html.HTMLParser(encoding=response.encoding if declared else 'utf-8')
+        return self._parse_response(response.content, parser)
+
+    def _parse_response(self, html_content, parser=None) -> Dict:
+        """Parse the page (str, or bytes in the parser's encoding) once and extract both the metadata and the schedule"""
+        root = lxml.html.fromstring(html_content, parser=parser)
         return {
-            "metadata": metadata,
-            "schedule": schedule
+            "metadata": self._metadata_from_tree(root),
+            "schedule": self._schedule_from_tree(root)
         }
 
     def _extract_metadata(self, html_content: str) -> Dict:
-        soup = BeautifulSoup(html_content, 'html.parser')
-        header_div = soup.find('div', style='font-weight:bold')
-        spans = header_div.find_all('span')
+        return self._metadata_from_tree(lxml.html.fromstring(html_content))
 
-        week_info = spans[0].text.strip()
-        class_info = spans[1].text.strip()
+    def _metadata_from_tree(self, root) -> Dict:
+        spans = _HEADER_SPANS(root)
+
+        week_info = spans[0].text_content().strip()
+        class_info = spans[1].text_content().strip()
 
         # Extract week number and dates
-        week_number = int(''.join(filter(str.isdigit, week_info.split(':')[0])))
-        dates = re.findall(r'\d{2}/\d{2}/\d{4}', week_info)
+        week_number = int(WEEK_NUM_RE.search(week_info.split(':', 1)[0]).group())
+        dates = DATE_RE.findall(week_info)
         
         return {
             "week_number": week_number,
@@ -203,42 +190,40 @@ class StudentScheduleCrawler:
 
     def parse_schedule(self, html_content: str) -> Dict[str, Dict]:
         """Parse the HTML content and extract schedule data"""
-        soup = BeautifulSoup(html_content, 'html.parser')
+        return self._schedule_from_tree(lxml.html.fromstring(html_content))
+
+    def _schedule_from_tree(self, root) -> Dict[str, Dict]:
         schedule = {}
         
         # Find the schedule table
-        table = soup.find('table')
-        if not table:
+        tables = _TABLES(root)
+        if not tables:
             raise Exception("Schedule table not found in HTML content")
             
         # Get all rows except header
-        rows = table.find_all('tr')[1:]  # Skip header row
+        rows = _ROWS(tables[0])[1:]  # Skip header row
         days = ['Thứ 2', 'Thứ 3', 'Thứ 4', 'Thứ 5', 'Thứ 6', 'Thứ 7', 'Chủ nhật']
         
         # Process each row (day)
         for row, day in zip(rows, days):
-            cells = row.find_all('td')
+            cells = _CELLS(row)
             if len(cells) >= 3:  # Should have morning, afternoon, evening cells
-                morning_sessions = self._parse_class_cell(cells[0])
-                afternoon_sessions = self._parse_class_cell(cells[1])
-                evening_sessions = self._parse_class_cell(cells[2])
-                
+                # Sessions go straight into the JSON structure, so they are built as dicts
                 schedule[day] = {
-                    'morning': [s.to_dict() for s in morning_sessions] if morning_sessions else [],
-                    'afternoon': [s.to_dict() for s in afternoon_sessions] if afternoon_sessions else [],
-                    'evening': [s.to_dict() for s in evening_sessions] if evening_sessions else []
+                    'morning': self._parse_class_cell(cells[0]),
+                    'afternoon': self._parse_class_cell(cells[1]),
+                    'evening': self._parse_class_cell(cells[2])
                 }
         
         return schedule
 
 def main():
-    crawler = StudentScheduleCrawler()
+    crawler = StudentScheduleCrawler(http_cache=True)
     schedule = crawler.fetch_schedule(3)  # Fetch week 3
     
-    # Save to JSON file
+    # Save to JSON file, serialized straight to UTF-8 bytes
     filename = f'student_schedule_{datetime.now().strftime("%Y%m%d")}.json'
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(schedule, f, ensure_ascii=False, indent=2)
+    Path(filename).write_bytes(json_utils.dumps(schedule, indent=True))
 
     print(f"Schedule saved to {filename}")
 
@@ -1,9 +1,17 @@
-from bs4 import BeautifulSoup
+import lxml.etree
 import json
 from dataclasses import dataclass, asdict
+from pathlib import Path
 import re
 
-@dataclass
+# orjson serializes much faster than the standard library; this script runs standalone,
+# so it cannot use the app's json_utils
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+@dataclass(slots=True, frozen=True)
 class Teacher:
     id: str
     last_name: str
@@ -13,21 +21,23 @@ class Teacher:
 class TeacherExtractor:
     def extract_name_parts(self, full_name: str) -> tuple[str, str]:
         """Extract first and last name from full name format: 'Last, First Middle'"""
-        parts = full_name.split(',', 1)
-        if len(parts) == 2:
-            last_name = parts[0].strip()
-            first_name = parts[1].strip()
-            return last_name, first_name
+        last_name, separator, first_name = full_name.partition(',')
+        if separator:
+            return last_name.strip(), first_name.strip()
         return full_name, ""
 
     def parse_teachers(self, html_file: str) -> list[Teacher]:
-        with open(html_file, 'r', encoding='utf-8') as f:
-            soup = BeautifulSoup(f.read(), 'html.parser')
+        # Every teacher is an <option> of the professor select box. Stream just those instead
+        # of building the whole page tree, freeing each one once read; the page declares no charset
+        options = lxml.etree.iterparse(
+            html_file, events=('end',), tag='option', html=True, encoding='utf-8'
+        )
         
         teachers = []
-        for option in soup.find_all('option'):
-            teacher_id = option['value']
-            full_name = option.text.strip()
+        for _, option in options:
+            teacher_id = option.get('value')
+            full_name = ''.join(option.itertext()).strip()
+            option.clear(keep_tail=True)
             last_name, first_name = self.extract_name_parts(full_name)
             
             teacher = Teacher(
@@ -46,8 +56,11 @@ class TeacherExtractor:
             "teachers": [asdict(t) for t in teachers]
         }
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+        Path(output_file).write_bytes(payload)
 
 def main():
     extractor = TeacherExtractor()